@@ -5,13 +5,19 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 import kagglehub
 import os
+import tempfile
 import warnings
 
 warnings.filterwarnings('ignore')
 
+# Bump whenever clean_data/add_custom_features change the frame that is cached on disk
+CACHE_SCHEMA_VERSION = 1
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="Mobile App Review Dashboard",
@@ -59,6 +65,7 @@ def load_and_process_data():
     """
     Downloads, cleans, and engineers features for the dataset.
     This function is cached to avoid re-running on every interaction.
+    Returns the dataframe along with its precomputed summaries.
     """
     try:
         # 1. Load Data from Kaggle
@@ -67,69 +74,161 @@ def load_and_process_data():
                 "pratyushpuri/multilingual-mobile-app-reviews-dataset-2025"
             )
             csv_path = os.path.join(path, 'multilingual_mobile_app_reviews_2025.csv')
-            df = pd.read_csv(csv_path)
-
-        # 2. Clean and prepare the data
-        df = clean_data(df)
 
-        # 3. Add new features for deeper analysis
-        df = add_custom_features(df)
-        return df
+        # The processed frame is also kept on disk so restarts can skip the CSV pipeline.
+        # The dataset slug, version and cache schema are part of the file name, so either change gets a
+        # fresh cache and other apps sharing the temp dir can't collide with it.
+        cache_path = os.path.join(
+            tempfile.gettempdir(),
+            f"multilingual-mobile-app-reviews_cache_v{os.path.basename(path)}_schema{CACHE_SCHEMA_VERSION}.parquet",
+        )
+        df = read_cached_frame(cache_path, csv_path)
+        if df is None:
+            df = read_reviews_csv(csv_path)
+
+            # 2. Clean and prepare the data
+            df = clean_data(df)
+
+            # 3. Add new features for deeper analysis
+            df = add_custom_features(df)
+            write_cached_frame(df, cache_path)
+
+        # 4. Precompute the aggregates for the unfiltered view and the sidebar options
+        precomputed = compute_summaries(df)
+        precomputed['app_options'] = sorted(df['app_name'].unique().tolist())
+        precomputed['category_options'] = sorted(df['app_category'].unique().tolist())
+        precomputed['date_min'] = df['review_date'].min().date()
+        precomputed['date_max'] = df['review_date'].max().date()
+        # Identifies this exact frame, so caches derived from it can key on it
+        precomputed['dataset_version'] = os.path.basename(cache_path)
+        return df, precomputed
 
     except Exception as e:
         st.error(f"Error loading dataset: {e}")
-        return None
+        return None, None
+
+def read_cached_frame(cache_path, csv_path):
+    """Returns the cached frame if it is newer than the CSV, or None if it is missing or unreadable."""
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+            return pd.read_parquet(cache_path)
+    except Exception:
+        pass
+    return None
+
+def write_cached_frame(df, cache_path):
+    """
+    Writes the frame to a temporary file and moves it into place, so readers never see a partial file.
+    Failures are ignored; the next start just rebuilds the frame from the CSV.
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        os.close(fd)
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def read_reviews_csv(csv_path):
+    """Reads only the columns we use, with their types declared up front."""
+    return pd.read_csv(
+        csv_path,
+        usecols=[
+            'review_text', 'rating', 'user_age', 'num_helpful_votes', 'review_date', 'user_country',
+            'user_gender', 'app_version', 'app_name', 'app_category', 'review_language',
+        ],
+        dtype={
+            'review_text': 'string[pyarrow]',
+            'rating': 'float32', 'user_age': 'float32', 'num_helpful_votes': 'float32',
+            'app_name': 'category', 'app_category': 'category', 'review_language': 'category',
+        },
+        parse_dates=['review_date'],
+        engine='pyarrow',
+    )
 
 def clean_data(df):
-    """Handles missing values, data types, and basic formatting."""
-    df_clean = df.copy()
-    df_clean.dropna(subset=['review_text'], inplace=True)
+    """Handles missing values, data types, and basic formatting. Modifies `df` in place."""
+    df.dropna(subset=['review_text'], inplace=True)
 
-    # Fix data types, filling missing numerical values with the median
-    df_clean['rating'] = pd.to_numeric(df_clean['rating'], errors='coerce').fillna(df_clean['rating'].median())
-    df_clean['user_age'] = df_clean['user_age'].fillna(df_clean['user_age'].median()).astype(int)
-    df_clean['num_helpful_votes'] = pd.to_numeric(df_clean['num_helpful_votes'], errors='coerce').fillna(0).astype(int)
-    df_clean['review_date'] = pd.to_datetime(df_clean['review_date'], errors='coerce')
+    # Fix data types, filling missing numerical values with the median.
+    # Narrow dtypes keep the column scans in filtering and aggregation cheap.
+    df['rating'] = df['rating'].fillna(df['rating'].median())
+    df['user_age'] = df['user_age'].fillna(df['user_age'].median()).astype('int8')
+    df['num_helpful_votes'] = df['num_helpful_votes'].fillna(0).astype('int32')
+    df['review_date'] = pd.to_datetime(df['review_date'], errors='coerce')
 
     # Fill categorical missing values with 'Unknown'
-    for col in ['user_country', 'user_gender', 'app_version']:
-        df_clean[col].fillna('Unknown', inplace=True)
+    cols = ['user_country', 'user_gender', 'app_version']
+    df[cols] = df[cols].fillna('Unknown')
 
     # Standardize app version format
-    df_clean['app_version'] = df_clean['app_version'].astype(str).str.lstrip('v')
-    return df_clean
+    df['app_version'] = df['app_version'].astype(str).str.lstrip('v')
 
-def add_custom_features(df):
-    """Engineers new features for analysis."""
-    df_enhanced = df.copy()
+    # Low-cardinality strings are much smaller and faster to compare as categoricals
+    for col in ['app_name', 'app_category', 'user_country', 'user_gender', 'app_version', 'review_language']:
+        df[col] = df[col].astype('category')
+    return df
 
-    # Text-based features
-    df_enhanced['review_length'] = df_enhanced['review_text'].str.len()
-    df_enhanced['review_word_count'] = df_enhanced['review_text'].str.split().str.len()
+def add_custom_features(df):
+    """Engineers new features for analysis. Modifies `df` in place."""
+    # Text-based features. The word pattern spells out the whitespace that str.split() uses,
+    # since Arrow-backed strings run regexes through RE2, where \s only matches ASCII whitespace.
+    word_pattern = '[^\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+'
+    df['review_length'] = df['review_text'].str.len().astype('int32')
+    df['review_word_count'] = df['review_text'].str.count(word_pattern).astype('int32')
 
-    # Time-based features
-    df_enhanced['review_year'] = df_enhanced['review_date'].dt.year
-    df_enhanced['review_month'] = df_enhanced['review_date'].dt.month
+    # Time-based features (nullable ints, as unparseable dates are NaT)
+    df['review_year'] = df['review_date'].dt.year.astype('Int16')
+    df['review_month'] = df['review_date'].dt.month.astype('Int8')
 
     # Derived categories for easier grouping and visualization
     rating_bins = [0, 1.9, 2.9, 3.9, 4.4, 5]
     rating_labels = ['Very Poor', 'Poor', 'Average', 'Good', 'Excellent']
-    df_enhanced['rating_category'] = pd.cut(df_enhanced['rating'], bins=rating_bins, labels=rating_labels, include_lowest=True)
+    df['rating_category'] = pd.Categorical.from_codes(bin_codes(df['rating'].values, rating_bins), categories=rating_labels, ordered=True)
 
     age_bins = [0, 17, 24, 34, 49, 100]
     age_labels = ['Teen', 'Young Adult', 'Adult', 'Middle Age', 'Senior']
-    df_enhanced['age_group'] = pd.cut(df_enhanced['user_age'], bins=age_bins, labels=age_labels, include_lowest=True)
+    df['age_group'] = pd.Categorical.from_codes(bin_codes(df['user_age'].values, age_bins), categories=age_labels, ordered=True)
 
-    return df_enhanced
+    return df
+
+def bin_codes(values, bins):
+    """
+    Bins values like `pd.cut(..., include_lowest=True)` but returns the category codes
+    directly. Values outside the bin edges get -1, i.e. NaN.
+    """
+    # Compare float columns at their own precision so values equal to an edge stay in the lower bin
+    bins = np.asarray(bins, dtype=values.dtype if values.dtype.kind == 'f' else None)
+    codes = np.digitize(values, bins[1:-1], right=True)
+    return np.where((values < bins[0]) | (values > bins[-1]), -1, codes)
+
+def compute_summaries(df, by_category=True):
+    """
+    Computes the aggregates shared by the charts and the insights panel.
+    The per-category means are skipped when `by_category` is False.
+    """
+    # Skip the full sort and take the top 10 with a partial sort instead.
+    # Unobserved app categories have zero counts and are dropped.
+    app_counts = df['app_name'].value_counts(sort=False)
+    return {
+        'top_apps': app_counts[app_counts > 0].nlargest(10),
+        'cat_mean_rating': df.groupby('app_category', observed=True)['rating'].mean() if by_category else None,
+        'age_mean_rating': df.groupby('age_group', observed=True)['rating'].mean(),
+    }
 
 
 # --- UI & Filtering ---
-def setup_sidebar(df):
+def setup_sidebar(precomputed):
     """Creates the sidebar with all the data filters."""
     st.sidebar.header("🔍 Data Filters")
 
-    app = st.sidebar.selectbox("Select App", ['All'] + sorted(df['app_name'].unique()))
-    category = st.sidebar.selectbox("Select Category", ['All'] + sorted(df['app_category'].unique()))
+    app = st.sidebar.selectbox("Select App", ['All'] + precomputed['app_options'])
+    category = st.sidebar.selectbox("Select Category", ['All'] + precomputed['category_options'])
     rating_range = st.sidebar.slider(
         "Rating Range",
         min_value=1.0, max_value=5.0,
@@ -137,37 +236,51 @@ def setup_sidebar(df):
     )
     date_range = st.sidebar.date_input(
         "Date Range",
-        value=(df['review_date'].min().date(), df['review_date'].max().date()),
-        min_value=df['review_date'].min().date(),
-        max_value=df['review_date'].max().date()
+        value=(precomputed['date_min'], precomputed['date_max']),
+        min_value=precomputed['date_min'],
+        max_value=precomputed['date_max']
     )
     return app, category, rating_range, date_range
 
-def filter_dataframe(df, app, category, rating_range, date_range):
-    """Applies the user's filters to the main dataframe."""
-    filtered_df = df.copy()
+@st.cache_resource(ttl=3600, max_entries=16, show_spinner=False)
+def filter_dataframe(_df, dataset_version, app, category, rating_range, date_range):
+    """
+    Applies the user's filters to the main dataframe.
+    `_df` is skipped when hashing; `dataset_version` stands in for it in the cache key
+    so a reloaded dataset never gets slices of the previous one.
+    Cached as a resource so hits return the same frame without a pickle round-trip;
+    callers must not modify the result.
+    """
+    df = _df
+    # Build one combined mask over the raw numpy arrays and index once at the end
+    mask = np.ones(len(df), dtype=bool)
+    ratings = df['rating'].values
+    # Cast the bounds to the column's float32 so e.g. a 4.4 rating still matches a 4.4 bound
+    low, high = np.asarray(rating_range, dtype=ratings.dtype)
+    mask &= (ratings >= low) & (ratings <= high)
+    if len(date_range) == 2:
+        # Compare the datetime64 values directly; the end date is inclusive
+        review_dates = df['review_date'].values
+        start_date = np.datetime64(date_range[0], 'D')
+        end_date = np.datetime64(date_range[1], 'D') + np.timedelta64(1, 'D')
+        mask &= (review_dates >= start_date) & (review_dates < end_date)
     if app != 'All':
-        filtered_df = filtered_df[filtered_df['app_name'] == app]
+        mask &= df['app_name'].values == app
     if category != 'All':
-        filtered_df = filtered_df[filtered_df['app_category'] == category]
-
-    filtered_df = filtered_df[
-        (filtered_df['rating'] >= rating_range[0]) &
-        (filtered_df['rating'] <= rating_range[1])
-    ]
-    if len(date_range) == 2:
-        start_date, end_date = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
-        filtered_df = filtered_df[
-            (filtered_df['review_date'].dt.date >= start_date.date()) &
-            (filtered_df['review_date'].dt.date <= end_date.date())
-        ]
-    return filtered_df
+        mask &= df['app_category'].values == category
+    return df[mask]
 
 
 # --- Plotting Functions ---
-def plot_rating_distribution(df):
-    fig = px.histogram(df, x='rating', nbins=20, title='Rating Distribution')
-    fig.add_vline(x=df['rating'].mean(), line_dash="dash", line_color="red", annotation_text=f"Mean: {df['rating'].mean():.2f}")
+def plot_rating_distribution(df, avg_rating):
+    # Bin with numpy so only the bin counts are sent to the browser, not every rating.
+    # One bin per 0.1 rating step, with edges halfway between steps so float32 rounding can't shift a rating.
+    counts, edges = np.histogram(df['rating'].values, bins=41, range=(0.95, 5.05))
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    fig = px.bar(x=centers, y=counts, title='Rating Distribution')
+    fig.update_traces(width=edges[1] - edges[0])
+    fig.update_layout(xaxis_title="rating", yaxis_title="count", bargap=0)
+    fig.add_vline(x=avg_rating, line_dash="dash", line_color="red", annotation_text=f"Mean: {avg_rating:.2f}")
     return fig
 
 def plot_sentiment_pie(df):
@@ -175,14 +288,24 @@ def plot_sentiment_pie(df):
     fig = px.pie(values=sentiment_counts.values, names=sentiment_counts.index, title='Review Sentiment Distribution')
     return fig
 
-def plot_top_apps(df):
-    top_apps = df['app_name'].value_counts().head(10).sort_values(ascending=True)
+def plot_top_apps(top_apps):
+    top_apps = top_apps.iloc[::-1]
     fig = px.bar(top_apps, y=top_apps.index, x=top_apps.values, orientation='h', title='Top 10 Most Reviewed Apps')
     fig.update_layout(xaxis_title="Number of Reviews", yaxis_title="App Name")
     return fig
 
 def plot_category_ratings(df):
-    fig = px.box(df, y='app_category', x='rating', title='Rating Distribution by App Category')
+    # Draw the boxes from precomputed statistics so no per-review points reach the browser
+    grouped = df.groupby('app_category', observed=True)['rating']
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats = quartiles.join(grouped.agg(['min', 'max']))
+    fig = go.Figure(go.Box(
+        y=stats.index.astype(str),
+        q1=stats[0.25], median=stats[0.5], q3=stats[0.75],
+        lowerfence=stats['min'], upperfence=stats['max'],
+        orientation='h', boxpoints=False,
+    ))
+    fig.update_layout(title='Rating Distribution by App Category', xaxis_title='rating', yaxis_title='app_category')
     return fig
 
 
@@ -191,26 +314,37 @@ def main():
     st.markdown('<h1 class="main-header">📱 Mobile App Reviews Dashboard</h1>', unsafe_allow_html=True)
     st.markdown("An interactive tool to analyze the Multilingual Mobile App Reviews Dataset.")
 
-    df = load_and_process_data()
+    df, precomputed = load_and_process_data()
     if df is None:
         return
 
     # --- Sidebar & Filtering ---
-    app, category, rating_range, date_range = setup_sidebar(df)
-    filtered_df = filter_dataframe(df, app, category, rating_range, date_range)
+    app, category, rating_range, date_range = setup_sidebar(precomputed)
+    # ISO strings keep the date range hashable and stable for the cache key
+    date_range = tuple(d.isoformat() for d in date_range)
+    filtered_df = filter_dataframe(df, precomputed['dataset_version'], app, category, rating_range, date_range)
 
     if filtered_df.empty:
         st.warning("No data matches the selected filters. Please adjust your selection.")
         return
 
+    n_reviews = len(filtered_df)
+    avg_rating = float(filtered_df['rating'].mean())
+
+    # Reuse the load-time aggregates when no rows were filtered out
+    if n_reviews == len(df):
+        summaries = precomputed
+    else:
+        summaries = compute_summaries(filtered_df, by_category=category == 'All')
+
     # --- Main Page Layout ---
-    st.info(f"Showing {len(filtered_df):,} reviews based on your filters.")
+    st.info(f"Showing {n_reviews:,} reviews based on your filters.")
 
     # Overview Metrics
     st.markdown("## 📊 Key Metrics")
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Reviews", f"{len(filtered_df):,}")
-    col2.metric("Average Rating", f"{filtered_df['rating'].mean():.2f}")
+    col1.metric("Total Reviews", f"{n_reviews:,}")
+    col2.metric("Average Rating", f"{avg_rating:.2f}")
     col3.metric("Unique Apps", f"{filtered_df['app_name'].nunique():,}")
     col4.metric("Languages", f"{filtered_df['review_language'].nunique():,}")
 
@@ -221,21 +355,22 @@ def main():
         st.header("General Overview")
         col1, col2 = st.columns([1, 1])
         with col1:
-            st.plotly_chart(plot_rating_distribution(filtered_df), use_container_width=True)
+            st.plotly_chart(plot_rating_distribution(filtered_df, avg_rating), use_container_width=True)
         with col2:
             st.plotly_chart(plot_sentiment_pie(filtered_df), use_container_width=True)
 
         if app == 'All': # Only show top apps if 'All' are selected
-             st.plotly_chart(plot_top_apps(filtered_df), use_container_width=True)
+             st.plotly_chart(plot_top_apps(summaries['top_apps']), use_container_width=True)
 
 
     with tab2:
         st.header("Deeper Analysis")
-        st.plotly_chart(plot_category_ratings(filtered_df), use_container_width=True)
+        if category == 'All': # A single selected category would only draw one box
+            st.plotly_chart(plot_category_ratings(filtered_df), use_container_width=True)
 
         # More plots can be added here, e.g., temporal trends, correlations etc.
         st.markdown("### Average Rating by Age Group")
-        age_group_ratings = filtered_df.groupby('age_group')['rating'].mean().sort_values()
+        age_group_ratings = summaries['age_mean_rating'].sort_values()
         st.bar_chart(age_group_ratings)
 
 
@@ -243,9 +378,11 @@ def main():
         st.header("Key Insights & Recommendations")
 
         # Dynamic insights based on filtered data
-        avg_rating = filtered_df['rating'].mean()
-        best_category = filtered_df.groupby('app_category')['rating'].mean().idxmax()
-        worst_category = filtered_df.groupby('app_category')['rating'].mean().idxmin()
+        if category != 'All':
+            best_category = worst_category = category
+        else:
+            best_category = summaries['cat_mean_rating'].idxmax()
+            worst_category = summaries['cat_mean_rating'].idxmin()
 
         st.markdown(f"""
         <div class="insight-box">